@@ -0,0 +1,61 @@
+"""
+공용 설정 로더
+
+.env는 프로세스당 한 번만 읽고, config/config.json은 파일이 바뀔 때만 다시 읽습니다.
+run_weekly_report.py처럼 여러 스크립트를 한 프로세스에서 import할 때
+같은 파일을 반복해서 파싱하지 않도록 결과를 캐시합니다.
+"""
+
+import os
+import json
+from functools import lru_cache
+
+# 프로젝트 루트 디렉토리
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV_PATH = os.path.join(PROJECT_ROOT, '.env')
+CONFIG_PATH = os.path.join(PROJECT_ROOT, 'config', 'config.json')
+
+# config.json 캐시: {경로: ((mtime_ns, size), config)}
+_config_cache = {}
+
+
+@lru_cache(maxsize=None)
+def load_env(override=False):
+    """.env를 os.environ에 로드 (override 값별로 1회)"""
+    from dotenv import load_dotenv
+
+    load_dotenv(ENV_PATH, override=override)
+    return os.environ
+
+
+def load_config():
+    """config.json 로드 (mtime/크기가 그대로면 캐시 반환, 반환값은 수정하지 말 것)"""
+    try:
+        st = os.stat(CONFIG_PATH)
+    except FileNotFoundError:
+        raise FileNotFoundError(
+            "config.json 파일이 없습니다.\n"
+            "먼저 create_notion_db.py를 실행하여 데이터베이스를 생성하세요."
+        ) from None
+
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _config_cache.get(CONFIG_PATH)
+    if cached and cached[0] == key:
+        return cached[1]
+
+    with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    _config_cache[CONFIG_PATH] = (key, config)
+    return config
+
+
+def update_config(**values):
+    """config.json에 값을 추가/갱신 (임시 파일에 쓴 뒤 os.replace로 교체)"""
+    config = dict(load_config())
+    config.update(values)
+
+    tmp_path = CONFIG_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, CONFIG_PATH)
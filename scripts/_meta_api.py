@@ -0,0 +1,140 @@
+"""
+Meta Graph API 공용 HTTP 세션
+
+Graph API 호출은 모두 하나의 requests.Session을 공유하여
+graph.facebook.com 커넥션(TCP + TLS)을 요청마다 새로 맺지 않도록 합니다.
+일시적인 오류(429/5xx, rate limit 에러 코드, 연결 끊김)는 지수 백오프로 재시도합니다.
+"""
+
+import os
+import json
+import time
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+import requests
+
+from _retry import backoff_delay
+
+API_VERSION = 'v19.0'
+BASE_URL = f'https://graph.facebook.com/{API_VERSION}'
+USER_AGENT = 'meta-ads-notion-reporter/1.0'
+REQUEST_TIMEOUT = 60  # 초
+
+# 재시도 설정
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 1.0   # 초
+BACKOFF_MAX = 60.0   # 초
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# Graph API rate limit 에러 코드 (4: 앱, 17: 사용자, 32: 페이지, 613: 커스텀)
+RATE_LIMIT_CODES = {4, 17, 32, 613}
+
+# Access Token 검증 결과 캐시 (토큰 원문이 아닌 SHA-256만 저장)
+TOKEN_CACHE_PATH = Path(os.environ.get('XDG_CACHE_HOME', '~/.cache')).expanduser() / 'meta-ads-reporter' / 'token_valid.json'
+TOKEN_CACHE_TTL = 3600  # 초
+
+
+@lru_cache(maxsize=1)
+def get_session():
+    """프로세스 공용 requests.Session (keep-alive 커넥션 풀)"""
+    session = requests.Session()
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+
+def _is_transient(response):
+    """재시도하면 성공할 수 있는 응답인지 판별"""
+    if response.status_code in RETRY_STATUS:
+        return True
+    if response.status_code == 200:
+        return False
+
+    # Meta는 rate limit을 400/403 + error.code로 알려주기도 함
+    try:
+        body = response.json()
+    except ValueError:
+        return False
+    error = body.get('error', {}) if isinstance(body, dict) else {}
+    return error.get('code') in RATE_LIMIT_CODES
+
+
+def graph_request(method, url, **kwargs):
+    """Graph API 요청 (일시적 오류 시 최대 MAX_ATTEMPTS회 재시도)
+
+    마지막 응답을 그대로 반환하므로 상태 코드 확인과 에러 처리는 호출자가 합니다.
+    """
+    kwargs.setdefault('timeout', REQUEST_TIMEOUT)
+
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        response = None
+        try:
+            response = get_session().request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == MAX_ATTEMPTS:
+                raise
+        else:
+            if attempt == MAX_ATTEMPTS or not _is_transient(response):
+                return response
+
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        delay = backoff_delay(retry_after, attempt, BACKOFF_BASE, BACKOFF_MAX)
+        reason = response.status_code if response is not None else '연결 오류'
+        print(f"   ⏳ Meta API 일시 오류({reason}) — {delay:.1f}초 후 재시도 ({attempt}/{MAX_ATTEMPTS - 1})")
+        time.sleep(delay)
+
+
+def _read_token_cache(token_hash):
+    """캐시된 검증 결과가 아직 유효하면 True"""
+    try:
+        cached = json.loads(TOKEN_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return False
+
+    # 손상된 캐시(dict가 아닌 JSON)는 캐시 미스로 처리
+    if not isinstance(cached, dict) or cached.get('token_sha256') != token_hash:
+        return False
+    now = time.time()
+    expires_at = cached.get('expires_at') or 0  # 0 = 만료 없음 (System User Token)
+    return now - cached.get('checked_at', 0) < TOKEN_CACHE_TTL and (not expires_at or now < expires_at)
+
+
+def validate_access_token(access_token):
+    """debug_token으로 Access Token 유효성 확인
+
+    검증 결과는 TOKEN_CACHE_TTL 동안 캐시하여 스크립트마다 왕복하지 않습니다.
+    토큰이 유효하지 않다고 응답(is_valid: false)한 경우에만 ValueError를 발생시키고,
+    debug_token 자체의 일시 오류/권한 오류는 경고만 남기고 넘어갑니다 (실제 호출에서 다시 드러남).
+    """
+    token_hash = hashlib.sha256(access_token.encode()).hexdigest()
+    if _read_token_cache(token_hash):
+        return
+
+    try:
+        response = graph_request('GET', f'{BASE_URL}/debug_token', params={
+            'input_token': access_token,
+            'access_token': access_token,
+        })
+        body = response.json() if response.status_code == 200 else None
+    except (requests.RequestException, ValueError) as e:
+        print(f"⚠️  Access Token 검증 요청 실패 — 검증 없이 진행합니다: {e}")
+        return
+
+    token_info = body.get('data') if isinstance(body, dict) else None
+    if not isinstance(token_info, dict) or 'is_valid' not in token_info:
+        print(f"⚠️  Access Token 검증 실패({response.status_code}) — 검증 없이 진행합니다: {response.text[:200]}")
+        return
+
+    if not token_info['is_valid']:
+        raise ValueError("META_ACCESS_TOKEN이 유효하지 않습니다 (만료 또는 권한 해제). 토큰을 재발급하세요.")
+
+    # 캐시 저장 실패는 검증 결과에 영향 없음
+    try:
+        TOKEN_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        TOKEN_CACHE_PATH.write_text(json.dumps({
+            'token_sha256': token_hash,
+            'checked_at': time.time(),
+            'expires_at': token_info.get('expires_at', 0),
+        }))
+    except OSError:
+        pass
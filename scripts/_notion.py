@@ -0,0 +1,110 @@
+"""
+Notion API 공용 클라이언트
+
+Notion API는 통합(integration)당 평균 초당 3회로 요청을 제한하고,
+버스트가 몰리면 429(rate_limited)와 Retry-After 대기를 돌려줍니다.
+모든 요청을 토큰 버킷으로 미리 간격을 맞춰 제한에 걸리지 않도록 하고,
+그래도 발생하는 일시적인 오류(429/5xx, 타임아웃)는 지수 백오프로 재시도합니다.
+"""
+
+import time
+import threading
+from functools import lru_cache
+
+from notion_client import Client
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
+
+from _retry import backoff_delay
+
+# 요청 속도 (Notion 한도 초당 3회보다 약간 낮게)
+REQUESTS_PER_SECOND = 2.5
+BURST = 3
+
+# 재시도 설정
+MAX_ATTEMPTS = 6
+BACKOFF_BASE = 1.0   # 초
+BACKOFF_MAX = 30.0   # 초
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷
+
+    rate: 초당 충전되는 토큰 수, capacity: 한 번에 몰아 쓸 수 있는 최대 토큰 수
+    """
+
+    def __init__(self, rate=REQUESTS_PER_SECOND, capacity=BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 1개 확보 (없으면 충전될 때까지 대기)"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            # 토큰을 먼저 예약하고(음수 허용) 락 밖에서 대기 → 대기 순서대로 간격 유지
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+
+        if wait:
+            time.sleep(wait)
+
+
+# 프로세스 내 모든 클라이언트가 공유 (Notion 한도는 통합 토큰 단위로 적용됨)
+_bucket = TokenBucket()
+
+
+def _safe_to_repeat(path, method):
+    """같은 요청을 다시 보내도 결과가 같은지 (페이지 생성/블록 추가는 중복 생성 위험)"""
+    if method == 'POST':
+        return path.endswith('/query')
+    if method == 'PATCH':
+        return not path.endswith('/children')
+    return True
+
+
+class RateLimitedClient(Client):
+    """모든 요청 전에 토큰 버킷을 거치고, 일시적 오류는 재시도하는 notion_client.Client
+
+    429는 요청이 처리되지 않은 것이므로 항상 재시도하고,
+    5xx/타임아웃은 다시 보내도 안전한 요청만 재시도합니다.
+    """
+
+    def __init__(self, *args, bucket=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.bucket = bucket or _bucket
+
+    def request(self, path, method, query=None, body=None, auth=None):
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            self.bucket.acquire()
+            try:
+                return super().request(path, method, query=query, body=body, auth=auth)
+            except HTTPResponseError as e:
+                retryable = e.status == 429 or (e.status in RETRY_STATUS and _safe_to_repeat(path, method))
+                if not retryable or attempt == MAX_ATTEMPTS:
+                    raise
+                error, reason = e, e.status
+            except RequestTimeoutError as e:
+                if not _safe_to_repeat(path, method) or attempt == MAX_ATTEMPTS:
+                    raise
+                error, reason = e, '타임아웃'
+
+            headers = getattr(error, 'headers', None) or {}  # 타임아웃은 응답 헤더 없음
+            delay = backoff_delay(headers.get('Retry-After'), attempt, BACKOFF_BASE, BACKOFF_MAX)
+            print(f"   ⏳ Notion API 일시 오류({reason}) — {delay:.1f}초 후 재시도 ({attempt}/{MAX_ATTEMPTS - 1})")
+            time.sleep(delay)
+
+
+@lru_cache(maxsize=None)
+def get_client(auth):
+    """토큰별 프로세스 공용 클라이언트
+
+    run_weekly_report.py처럼 여러 스크립트가 한 프로세스에서 실행될 때
+    같은 httpx 커넥션 풀(keep-alive)을 재사용하여 요청마다 TLS 연결을 새로 맺지 않습니다.
+    """
+    return RateLimitedClient(auth=auth)
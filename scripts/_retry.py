@@ -0,0 +1,18 @@
+"""
+재시도 대기 시간 공용 계산
+
+Meta API, Notion API, 파이프라인 단계 재시도가 같은 백오프 규칙을 쓰도록 한 곳에 둡니다.
+"""
+
+import random
+
+
+def backoff_delay(retry_after, attempt, base, cap):
+    """Retry-After 값이 있으면 따르고, 없으면 지수 백오프 + jitter (초)
+
+    retry_after: Retry-After 헤더 값 (없으면 None 또는 빈 문자열)
+    attempt: 1부터 시작하는 시도 횟수 (base, base*2, base*4 ... 최대 cap초)
+    """
+    if retry_after and str(retry_after).isdigit():
+        return min(float(retry_after), cap)
+    return min(cap, base * 2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
@@ -9,15 +9,17 @@ config.json에 database_id를 저장합니다.
 import os
 import sys
 import json
-from dotenv import load_dotenv
-from notion_client import Client
+from datetime import datetime, timezone
+
+import _config
+import _notion
 
 # 프로젝트 루트 디렉토리
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
 
 # 환경 변수 로드
-load_dotenv(os.path.join(PROJECT_ROOT, '.env'))
+_config.load_env()
 
 
 def create_database(notion, parent_page_id):
@@ -126,15 +128,13 @@ def create_database(notion, parent_page_id):
 
 def save_config(database_id, database_url):
     """config.json에 database_id 저장"""
-    config_dir = os.path.join(PROJECT_ROOT, 'config')
-    os.makedirs(config_dir, exist_ok=True)
-
-    config_path = os.path.join(config_dir, 'config.json')
+    config_path = _config.CONFIG_PATH
+    os.makedirs(os.path.dirname(config_path), exist_ok=True)
 
     config = {
         'notion_database_id': database_id,
         'notion_database_url': database_url,
-        'created_at': os.popen('date -u +"%Y-%m-%dT%H:%M:%SZ"').read().strip()
+        'created_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
     }
 
     with open(config_path, 'w', encoding='utf-8') as f:
@@ -156,7 +156,7 @@ def main():
         if not notion_token:
             raise ValueError("NOTION_TOKEN이 .env에 설정되어야 합니다.")
 
-        notion = Client(auth=notion_token)
+        notion = _notion.get_client(notion_token)
         print("✅ Notion API 인증 완료")
 
         # Parent Page ID
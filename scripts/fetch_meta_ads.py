@@ -10,7 +10,9 @@ Meta Marketing API 데이터 수집 스크립트
 import os
 import sys
 import json
+import gzip
 import urllib.request
+from urllib.parse import urlencode
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -50,15 +52,15 @@ def _ping_healthcheck(status: str = "success", body: str = ""):
 
 # ── Third-party imports ──────────────────────────────────────
 try:
-    import requests
-    from dotenv import load_dotenv
+    from _config import load_env
+    from _meta_api import BASE_URL, graph_request, validate_access_token
 except ImportError as exc:
     _ping_healthcheck("fail", f"ImportError: {exc}")
     print(f"[FATAL] 필수 패키지 import 실패: {exc}")
     raise SystemExit(1)
 
 # 환경 변수 로드 (load_dotenv로 덮어쓰기 — 수동 파싱보다 정확)
-load_dotenv(os.path.join(PROJECT_ROOT, '.env'), override=True)
+load_env(override=True)
 
 
 def get_date_range():
@@ -87,23 +89,46 @@ def get_date_range():
 
 
 def get_access_token():
-    """Access Token 확인"""
+    """Access Token 확인 (debug_token 검증, 결과는 1시간 캐시)"""
     access_token = os.getenv('META_ACCESS_TOKEN')
 
     if not access_token:
         raise ValueError("META_ACCESS_TOKEN이 .env에 설정되어야 합니다.")
 
+    validate_access_token(access_token)
+
     print("✅ Meta API Access Token 확인 완료")
     return access_token
 
 
-def fetch_campaign_insights(ad_account_id, date_range, access_token):
-    """캠페인별 성과 데이터 수집"""
-    api_version = 'v19.0'
-    base_url = f'https://graph.facebook.com/{api_version}'
+# 오디언스 breakdown → 로그 라벨
+AUDIENCE_BREAKDOWNS = {
+    'age': '연령대',
+    'gender': '성별',
+    'region': '지역',
+}
 
-    # 수집할 필드
-    fields = [
+
+def _insights_relative_url(ad_account_id, fields, date_range, **extra_params):
+    """batch 하위 요청용 insights relative_url 생성 (access_token은 batch 본문에서 공유)"""
+    params = {
+        'fields': ','.join(fields),
+        'time_range': json.dumps(date_range),
+        'level': 'campaign',
+        'limit': 500,
+        **extra_params,
+    }
+    return f'{ad_account_id}/insights?{urlencode(params)}'
+
+
+def fetch_all_insights(ad_account_id, date_range, access_token):
+    """캠페인 성과 + 오디언스 breakdown 데이터 수집
+
+    캠페인 레벨 1건과 age/gender/region breakdown 3건을 Graph API batch 요청
+    한 번으로 묶어 보냅니다. 반환: (campaign_data, audience_data)
+    """
+    # 캠페인 레벨 수집 필드
+    campaign_fields = [
         'campaign_id',
         'campaign_name',
         'impressions',
@@ -120,37 +145,8 @@ def fetch_campaign_insights(ad_account_id, date_range, access_token):
         'cost_per_action_type',
     ]
 
-    # API 요청 파라미터
-    params = {
-        'access_token': access_token,
-        'fields': ','.join(fields),
-        'time_range': json.dumps(date_range),
-        'level': 'campaign',
-        'limit': 500
-    }
-
-    print(f"📊 캠페인 인사이트 수집 중... ({date_range['since']} ~ {date_range['until']})")
-
-    # API 호출
-    url = f'{base_url}/{ad_account_id}/insights'
-    response = requests.get(url, params=params)
-
-    if response.status_code != 200:
-        raise Exception(f"Meta API 에러: {response.status_code} - {response.text}")
-
-    data = response.json()
-    campaign_data = data.get('data', [])
-
-    print(f"   ✅ {len(campaign_data)}개 캠페인 데이터 수집 완료")
-    return campaign_data
-
-
-def fetch_audience_insights(ad_account_id, date_range, access_token):
-    """오디언스 breakdown 데이터 수집"""
-    api_version = 'v19.0'
-    base_url = f'https://graph.facebook.com/{api_version}'
-
-    fields = [
+    # 오디언스 breakdown 수집 필드
+    audience_fields = [
         'campaign_id',
         'campaign_name',
         'impressions',
@@ -159,57 +155,45 @@ def fetch_audience_insights(ad_account_id, date_range, access_token):
         'actions',
     ]
 
-    audience_data = {}
-
-    # 연령대별 분석 (캠페인별)
-    print("📊 연령대별 인사이트 수집 중...")
-    params = {
-        'access_token': access_token,
-        'fields': ','.join(fields),
-        'time_range': json.dumps(date_range),
-        'level': 'campaign',
-        'breakdowns': 'age',
-        'limit': 500
-    }
-    url = f'{base_url}/{ad_account_id}/insights'
-    response = requests.get(url, params=params)
+    # (결과 키, 로그 라벨, relative_url) — batch 응답은 요청 순서대로 돌아옴
+    sub_requests = [('campaign', '캠페인', _insights_relative_url(ad_account_id, campaign_fields, date_range))]
+    for breakdown, label in AUDIENCE_BREAKDOWNS.items():
+        sub_requests.append((
+            breakdown,
+            label,
+            _insights_relative_url(ad_account_id, audience_fields, date_range, breakdowns=breakdown),
+        ))
 
-    if response.status_code != 200:
-        raise Exception(f"Meta API 에러 (연령대): {response.status_code} - {response.text}")
+    batch = [{'method': 'GET', 'relative_url': relative_url} for _, _, relative_url in sub_requests]
 
-    audience_data['age'] = response.json().get('data', [])
-    print(f"   ✅ {len(audience_data['age'])}개 연령대 데이터 수집 완료")
+    print(f"📊 캠페인 + 오디언스 인사이트 수집 중... ({date_range['since']} ~ {date_range['until']})")
 
-    # 성별 분석
-    print("📊 성별 인사이트 수집 중...")
-    params['breakdowns'] = 'gender'
-    response = requests.get(url, params=params)
+    # API 호출 (batch)
+    response = graph_request('POST', BASE_URL, data={
+        'access_token': access_token,
+        'batch': json.dumps(batch),
+    })
 
     if response.status_code != 200:
-        raise Exception(f"Meta API 에러 (성별): {response.status_code} - {response.text}")
+        raise Exception(f"Meta API 에러 (batch): {response.status_code} - {response.text}")
 
-    audience_data['gender'] = response.json().get('data', [])
-    print(f"   ✅ {len(audience_data['gender'])}개 성별 데이터 수집 완료")
+    results = {}
+    for (key, label, _), item in zip(sub_requests, response.json()):
+        # 하위 요청이 타임아웃되면 해당 항목은 null로 옴
+        if not item or item.get('code') != 200:
+            code = item.get('code') if item else None
+            body = item.get('body') if item else '응답 없음'
+            raise Exception(f"Meta API 에러 ({label}): {code} - {body}")
 
-    # 지역별 분석
-    print("📊 지역별 인사이트 수집 중...")
-    params['breakdowns'] = 'region'
-    response = requests.get(url, params=params)
+        results[key] = json.loads(item['body']).get('data', [])
+        print(f"   ✅ {len(results[key])}개 {label} 데이터 수집 완료")
 
-    if response.status_code != 200:
-        raise Exception(f"Meta API 에러 (지역): {response.status_code} - {response.text}")
-
-    audience_data['region'] = response.json().get('data', [])
-    print(f"   ✅ {len(audience_data['region'])}개 지역 데이터 수집 완료")
-
-    return audience_data
+    campaign_data = results.pop('campaign')
+    return campaign_data, results
 
 
 def fetch_adset_insights(ad_account_id, date_range, access_token):
     """AdSet 레벨 성과 데이터 수집"""
-    api_version = 'v19.0'
-    base_url = f'https://graph.facebook.com/{api_version}'
-
     fields = [
         'campaign_id',
         'campaign_name',
@@ -236,8 +220,8 @@ def fetch_adset_insights(ad_account_id, date_range, access_token):
     }
 
     print("📊 AdSet 인사이트 수집 중...")
-    url = f'{base_url}/{ad_account_id}/insights'
-    response = requests.get(url, params=params)
+    url = f'{BASE_URL}/{ad_account_id}/insights'
+    response = graph_request('GET', url, params=params)
 
     if response.status_code != 200:
         raise Exception(f"Meta API 에러 (AdSet): {response.status_code} - {response.text}")
@@ -249,9 +233,6 @@ def fetch_adset_insights(ad_account_id, date_range, access_token):
 
 def fetch_ad_insights(ad_account_id, date_range, access_token):
     """Ad(소재) 레벨 성과 데이터 수집"""
-    api_version = 'v19.0'
-    base_url = f'https://graph.facebook.com/{api_version}'
-
     fields = [
         'campaign_id',
         'campaign_name',
@@ -280,8 +261,8 @@ def fetch_ad_insights(ad_account_id, date_range, access_token):
     }
 
     print("📊 Ad(소재) 인사이트 수집 중...")
-    url = f'{base_url}/{ad_account_id}/insights'
-    response = requests.get(url, params=params)
+    url = f'{BASE_URL}/{ad_account_id}/insights'
+    response = graph_request('GET', url, params=params)
 
     if response.status_code != 200:
         raise Exception(f"Meta API 에러 (Ad): {response.status_code} - {response.text}")
@@ -292,11 +273,11 @@ def fetch_ad_insights(ad_account_id, date_range, access_token):
 
 
 def save_data(data, filename):
-    """데이터를 JSON 파일로 저장"""
+    """데이터를 gzip 압축 JSON 파일로 저장 (들여쓰기 없이 — 파일 크기·직렬화 비용 절감)"""
     output_path = os.path.join(PROJECT_ROOT, 'data', 'raw', filename)
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    with gzip.open(output_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+        f.write(json.dumps(data, ensure_ascii=False))
 
     print(f"💾 데이터 저장: {output_path}")
     return output_path
@@ -323,8 +304,7 @@ def main():
         date_range = get_date_range()
 
         # 데이터 수집
-        campaign_data = fetch_campaign_insights(ad_account_id, date_range, access_token)
-        audience_data = fetch_audience_insights(ad_account_id, date_range, access_token)
+        campaign_data, audience_data = fetch_all_insights(ad_account_id, date_range, access_token)
         adset_data = fetch_adset_insights(ad_account_id, date_range, access_token)
         ad_data = fetch_ad_insights(ad_account_id, date_range, access_token)
 
@@ -348,7 +328,7 @@ def main():
         }
 
         # 파일명 생성
-        filename = f"ads_data_{datetime.now().strftime('%Y-%m-%d')}.json"
+        filename = f"ads_data_{datetime.now().strftime('%Y-%m-%d')}.json.gz"
 
         # 저장
         output_path = save_data(full_data, filename)
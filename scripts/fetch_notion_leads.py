@@ -8,16 +8,39 @@ Notion 문의 데이터 수집 스크립트
 import os
 import sys
 import json
+import gzip
 from datetime import datetime
-from dotenv import load_dotenv
-from notion_client import Client
+
+import _config
+import _notion
 
 # 프로젝트 루트 디렉토리
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
 
 # 환경 변수 로드
-load_dotenv(os.path.join(PROJECT_ROOT, '.env'))
+_config.load_env()
+
+
+def _extract_lead(page):
+    """Notion 페이지 1건에서 문의 정보 추출"""
+    props = page['properties']
+
+    # 이름 추출
+    title = props.get('Name', {}).get('title')
+    name = title[0]['text']['content'] if title else ''
+
+    # 회사명 추출
+    rich_text = props.get('Company', {}).get('rich_text')
+    company = rich_text[0]['text']['content'] if rich_text else ''
+
+    return {
+        'name': name,
+        'company': company,
+        'email': props.get('Email', {}).get('email', ''),
+        'created_at': page.get('created_time', ''),
+        'page_id': page['id']
+    }
 
 
 def fetch_leads_from_notion(date_range):
@@ -31,25 +54,26 @@ def fetch_leads_from_notion(date_range):
     if not leads_db_id:
         raise ValueError("NOTION_LEADS_DATABASE_ID가 .env에 설정되어야 합니다.")
 
-    notion = Client(auth=notion_token)
+    notion = _notion.get_client(notion_token)
 
     print(f"📊 Notion 문의 데이터 수집 중... ({date_range['since']} ~ {date_range['until']})")
 
     # 날짜 범위로 필터링
-    # Created At이 date_range 내에 있는 것만
+    # 페이지 생성 시각(created_time)이 date_range 내에 있는 것만
+    # 속성 필터 대신 timestamp 필터 사용 — 'Created At' 속성이 없어도 동작
     start_datetime = f"{date_range['since']}T00:00:00Z"
     end_datetime = f"{date_range['until']}T23:59:59Z"
 
     filter_params = {
         "and": [
             {
-                "property": "Created At",
+                "timestamp": "created_time",
                 "created_time": {
                     "on_or_after": start_datetime
                 }
             },
             {
-                "property": "Created At",
+                "timestamp": "created_time",
                 "created_time": {
                     "on_or_before": end_datetime
                 }
@@ -57,50 +81,23 @@ def fetch_leads_from_notion(date_range):
         ]
     }
 
-    # 데이터베이스 쿼리
-    results = []
+    # 데이터베이스 쿼리 — 페이지 단위로 받아 바로 추출 (전체 결과를 쌓아두지 않음)
+    query_kwargs = {
+        'database_id': leads_db_id,
+        'filter': filter_params,
+        'page_size': 100,  # Notion 최대값 — 페이지네이션 왕복 최소화
+    }
+    leads = []
     has_more = True
-    next_cursor = None
 
     while has_more:
-        response = notion.databases.query(
-            database_id=leads_db_id,
-            filter=filter_params,
-            start_cursor=next_cursor
-        )
-
-        results.extend(response.get('results', []))
-        has_more = response.get('has_more', False)
-        next_cursor = response.get('next_cursor')
-
-    # 데이터 추출
-    leads = []
-    for page in results:
-        props = page['properties']
-
-        # 이름 추출
-        name = ''
-        if props.get('Name', {}).get('title'):
-            name = props['Name']['title'][0]['text']['content']
-
-        # 회사명 추출
-        company = ''
-        if props.get('Company', {}).get('rich_text'):
-            company = props['Company']['rich_text'][0]['text']['content']
-
-        # 이메일 추출
-        email = props.get('Email', {}).get('email', '')
+        response = notion.databases.query(**query_kwargs)
 
-        # 생성 시간 추출
-        created_at = props.get('Created At', {}).get('created_time', '')
+        leads.extend(_extract_lead(page) for page in response['results'])
 
-        leads.append({
-            'name': name,
-            'company': company,
-            'email': email,
-            'created_at': created_at,
-            'page_id': page['id']
-        })
+        has_more = response['has_more']
+        if has_more:
+            query_kwargs['start_cursor'] = response['next_cursor']
 
     print(f"   ✅ {len(leads)}개 문의 수집 완료")
 
@@ -108,12 +105,12 @@ def fetch_leads_from_notion(date_range):
 
 
 def save_leads_data(leads, date_range):
-    """문의 데이터를 JSON 파일로 저장"""
+    """문의 데이터를 gzip 압축 JSON 파일로 저장"""
     output_path = os.path.join(
         PROJECT_ROOT,
         'data',
         'raw',
-        f"notion_leads_{datetime.now().strftime('%Y-%m-%d')}.json"
+        f"notion_leads_{datetime.now().strftime('%Y-%m-%d')}.json.gz"
     )
 
     data = {
@@ -123,8 +120,8 @@ def save_leads_data(leads, date_range):
         'leads': leads
     }
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    with gzip.open(output_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+        f.write(json.dumps(data, ensure_ascii=False))
 
     print(f"💾 문의 데이터 저장: {output_path}")
     return output_path
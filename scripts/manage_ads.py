@@ -16,34 +16,19 @@ Meta 광고 관리 스크립트 (on/off)
 import os
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # ── 프로젝트 설정 ──────────────────────────────────────────────
 PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
 sys.path.insert(0, PROJECT_ROOT)
 
-# .env 수동 파싱 (기존 프로젝트 패턴 유지)
-_dotenv_path = os.path.join(PROJECT_ROOT, '.env')
-if os.path.isfile(_dotenv_path):
-    with open(_dotenv_path) as _f:
-        for _line in _f:
-            _line = _line.strip()
-            if not _line or _line.startswith('#') or '=' not in _line:
-                continue
-            _key, _, _val = _line.partition('=')
-            _key = _key.strip()
-            _val = _val.strip().strip('"').strip("'")
-            if _key and _key not in os.environ:
-                os.environ[_key] = _val
-
-import requests
-from dotenv import load_dotenv
-
-load_dotenv(os.path.join(PROJECT_ROOT, '.env'), override=True)
+from _config import load_env
+from _meta_api import BASE_URL, graph_request, validate_access_token
+
+load_env(override=True)
 
 # ── 상수 ──────────────────────────────────────────────────────
-API_VERSION = 'v19.0'
-BASE_URL = f'https://graph.facebook.com/{API_VERSION}'
 ACCESS_TOKEN = os.getenv('META_ACCESS_TOKEN')
 AD_ACCOUNT_ID = os.getenv('META_AD_ACCOUNT_ID')
 
@@ -70,6 +55,11 @@ def _check_config():
     if not AD_ACCOUNT_ID:
         print("❌ META_AD_ACCOUNT_ID가 .env에 설정되어야 합니다.")
         sys.exit(1)
+    try:
+        validate_access_token(ACCESS_TOKEN)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
 
 
 # ── 조회 ──────────────────────────────────────────────────────
@@ -80,15 +70,22 @@ def list_objects(level: str):
     params = {
         'access_token': ACCESS_TOKEN,
         'fields': 'id,name,status,effective_status',
-        'limit': 100,
+        'limit': 500,
     }
 
-    resp = requests.get(url, params=params)
-    if resp.status_code != 200:
-        print(f"❌ API 에러: {resp.status_code} - {resp.text}")
-        sys.exit(1)
+    # paging.next 커서를 따라 전체 목록 수집
+    items = []
+    while url:
+        resp = graph_request('GET', url, params=params)
+        if resp.status_code != 200:
+            print(f"❌ API 에러: {resp.status_code} - {resp.text}")
+            sys.exit(1)
+
+        body = resp.json()
+        items.extend(body.get('data', []))
+        url = body.get('paging', {}).get('next')
+        params = None  # next URL에 토큰·필드·커서가 모두 포함됨
 
-    items = resp.json().get('data', [])
     if not items:
         print(f"조회된 {level}이(가) 없습니다.")
         return
@@ -97,41 +94,63 @@ def list_objects(level: str):
     order = {'ACTIVE': 0, 'PAUSED': 1}
     items.sort(key=lambda x: order.get(x.get('effective_status', ''), 9))
 
-    print(f"\n{'=' * 70}")
-    print(f"  {level.upper()} 목록  ({len(items)}개)")
-    print(f"{'=' * 70}")
-    print(f"  {'상태':<14} {'ID':<22} 이름")
-    print(f"  {'-' * 14} {'-' * 22} {'-' * 30}")
-
+    # 행이 많은 계정을 위해 출력 전체를 모아 한 번에 write
+    lines = [
+        f"\n{'=' * 70}",
+        f"  {level.upper()} 목록  ({len(items)}개)",
+        f"{'=' * 70}",
+        f"  {'상태':<14} {'ID':<22} 이름",
+        f"  {'-' * 14} {'-' * 22} {'-' * 30}",
+    ]
     for item in items:
         status = item.get('effective_status', 'UNKNOWN')
         display = STATUS_DISPLAY.get(status, f'❓ {status}')
-        print(f"  {display:<14} {item['id']:<22} {item['name']}")
+        lines.append(f"  {display:<14} {item['id']:<22} {item['name']}")
 
-    print()
+    sys.stdout.write('\n'.join(lines) + '\n\n')
 
 
 # ── 상태 변경 ─────────────────────────────────────────────────
+# 동시 요청 상한 (계정 단위 rate limit 고려)
+MAX_STATUS_WORKERS = 10
+
+
+def _post_status(obj_id: str, new_status: str):
+    """단일 객체 상태 변경 요청. 반환: (obj_id, 성공 여부, 에러 본문)"""
+    url = f'{BASE_URL}/{obj_id}'
+    params = {
+        'access_token': ACCESS_TOKEN,
+        'status': new_status,
+    }
+    resp = graph_request('POST', url, params=params)
+
+    if resp.status_code == 200 and resp.json().get('success'):
+        return obj_id, True, ''
+    return obj_id, False, resp.text
+
+
 def update_status(object_ids: list[str], new_status: str):
-    """광고 객체 상태 변경 (ACTIVE / PAUSED)"""
+    """광고 객체 상태 변경 (ACTIVE / PAUSED)
+
+    ID 간 순서 의존성이 없으므로 요청은 동시에 보내고, 결과는 입력 순서대로 출력합니다.
+    """
     action = '활성화' if new_status == 'ACTIVE' else '일시정지'
+    emoji = '🟢' if new_status == 'ACTIVE' else '⏸️ '
     print(f"\n{len(object_ids)}개 객체 {action} 중...\n")
 
+    with ThreadPoolExecutor(max_workers=min(MAX_STATUS_WORKERS, len(object_ids))) as executor:
+        results = list(executor.map(
+            lambda obj_id: _post_status(obj_id, new_status),
+            object_ids,
+        ))
+
     success, fail = 0, 0
-    for obj_id in object_ids:
-        url = f'{BASE_URL}/{obj_id}'
-        params = {
-            'access_token': ACCESS_TOKEN,
-            'status': new_status,
-        }
-        resp = requests.post(url, params=params)
-
-        if resp.status_code == 200 and resp.json().get('success'):
-            emoji = '🟢' if new_status == 'ACTIVE' else '⏸️ '
+    for obj_id, ok, err_text in results:
+        if ok:
             print(f"  {emoji} {obj_id} → {action} 완료")
             success += 1
         else:
-            print(f"  ❌ {obj_id} → 실패: {resp.text}")
+            print(f"  ❌ {obj_id} → 실패: {err_text}")
             fail += 1
 
     print(f"\n결과: 성공 {success}개 / 실패 {fail}개")
@@ -11,47 +11,75 @@ Meta Ads 데이터 처리 스크립트
 import os
 import sys
 import json
+import argparse
+import gzip
 from datetime import datetime
-from pathlib import Path
+from operator import itemgetter
 
 # 프로젝트 루트 디렉토리
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
 
+# 가장 최근 처리 결과 파일명을 기록하는 포인터 파일 (send_to_notion.py가 import하여 읽음)
+LATEST_POINTER = 'LATEST'
+
+# 지출 순 정렬 키 (C 구현 itemgetter로 정렬 시 lambda 호출 제거, send_to_notion.py와 공용)
+by_spend = itemgetter('spend')
+
+
+def _load_json(path):
+    """JSON 파일 로드 (.json.gz는 gzip으로 해제, 이전 .json 파일도 지원)"""
+    opener = gzip.open if str(path).endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def find_latest_file(directory, prefix, suffixes=('.json', '.json.gz')):
+    """directory에서 prefix로 시작하고 suffixes로 끝나는 가장 최근 파일 경로 (없으면 None)
+
+    os.scandir 한 번으로 디렉토리를 훑고, DirEntry.stat()으로 mtime을 비교합니다.
+    send_to_notion.py도 LATEST 포인터가 없을 때 이 함수로 처리 결과 파일을 찾습니다.
+    """
+    latest_path, latest_mtime = None, -1.0
+
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if not name.startswith(prefix) or not name.endswith(suffixes):
+                    continue
+                mtime = entry.stat().st_mtime
+                if mtime > latest_mtime:
+                    latest_path, latest_mtime = entry.path, mtime
+    except FileNotFoundError:
+        return None
+
+    return latest_path
+
 
 def get_latest_raw_data():
     """data/raw/에서 가장 최근 데이터 파일 찾기"""
-    raw_dir = os.path.join(PROJECT_ROOT, 'data', 'raw')
-    json_files = list(Path(raw_dir).glob('ads_data_*.json'))
+    latest_file = find_latest_file(os.path.join(PROJECT_ROOT, 'data', 'raw'), 'ads_data_')
 
-    if not json_files:
+    if not latest_file:
         raise FileNotFoundError(f"data/raw/ 디렉토리에 데이터 파일이 없습니다.")
 
-    latest_file = max(json_files, key=lambda p: p.stat().st_mtime)
     print(f"📂 Meta 광고 데이터 로드: {latest_file}")
 
-    with open(latest_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    return data
+    return _load_json(latest_file)
 
 
 def get_latest_notion_leads():
     """data/raw/에서 가장 최근 Notion 문의 데이터 찾기"""
-    raw_dir = os.path.join(PROJECT_ROOT, 'data', 'raw')
-    json_files = list(Path(raw_dir).glob('notion_leads_*.json'))
+    latest_file = find_latest_file(os.path.join(PROJECT_ROOT, 'data', 'raw'), 'notion_leads_')
 
-    if not json_files:
+    if not latest_file:
         print("⚠️  Notion 문의 데이터를 찾을 수 없습니다. 전환 수를 0으로 계산합니다.")
         return {'total_leads': 0, 'leads': []}
 
-    latest_file = max(json_files, key=lambda p: p.stat().st_mtime)
     print(f"📂 Notion 문의 데이터 로드: {latest_file}")
 
-    with open(latest_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    return data
+    return _load_json(latest_file)
 
 
 def safe_float(value, default=0.0):
@@ -70,28 +98,36 @@ def safe_int(value, default=0):
         return default
 
 
-def extract_actions(actions, action_type):
-    """actions 배열에서 특정 action_type의 값 추출"""
+def _action_map(actions):
+    """actions/action_values 배열을 {action_type: value} dict로 변환 (한 번만 순회)"""
     if not actions or not isinstance(actions, list):
-        return 0
+        return {}
 
+    action_map = {}
     for action in actions:
-        if action.get('action_type') == action_type:
-            return safe_int(action.get('value', 0))
-
-    return 0
-
+        # 같은 action_type이 중복되면 첫 번째 값 사용
+        action_map.setdefault(action.get('action_type'), action.get('value', 0))
+    return action_map
 
-def extract_action_values(action_values, action_type):
-    """action_values 배열에서 특정 action_type의 값 추출"""
-    if not action_values or not isinstance(action_values, list):
-        return 0.0
 
-    for action in action_values:
-        if action.get('action_type') == action_type:
-            return safe_float(action.get('value', 0))
-
-    return 0.0
+def _empty_metrics(campaign):
+    """노출/클릭/지출/전환이 모두 없는 캠페인의 메트릭 (계산 없이 0으로 채움)"""
+    return {
+        'campaign_id': campaign.get('campaign_id'),
+        'campaign_name': campaign.get('campaign_name'),
+        'impressions': 0,
+        'clicks': 0,
+        'spend': 0.0,
+        'reach': safe_int(campaign.get('reach', 0)),
+        'frequency': safe_float(campaign.get('frequency', 0)),
+        'cpc': 0,
+        'ctr': 0,
+        'cpm': safe_float(campaign.get('cpm', 0)),
+        'conversions': {'purchase': 0, 'lead': 0, 'add_to_cart': 0, 'link_click': 0, 'total': 0},
+        'conversion_value': {'purchase': 0.0, 'total': 0.0},
+        'cpa': 0,
+        'roas': 0
+    }
 
 
 def calculate_metrics(campaign):
@@ -100,19 +136,23 @@ def calculate_metrics(campaign):
     clicks = safe_int(campaign.get('clicks', 0))
     spend = safe_float(campaign.get('spend', 0))
 
+    # 휴면 캠페인은 전환 추출과 메트릭 계산 생략
+    if not (impressions or clicks or spend or campaign.get('actions') or campaign.get('action_values')):
+        return _empty_metrics(campaign)
+
     # 전환 데이터 추출
-    actions = campaign.get('actions', [])
-    action_values = campaign.get('action_values', [])
+    actions = _action_map(campaign.get('actions', []))
+    action_values = _action_map(campaign.get('action_values', []))
 
     # 주요 전환 타입
-    purchase = extract_actions(actions, 'purchase')
-    lead = extract_actions(actions, 'lead')
-    add_to_cart = extract_actions(actions, 'add_to_cart')
-    link_click = extract_actions(actions, 'link_click')
+    purchase = safe_int(actions.get('purchase', 0))
+    lead = safe_int(actions.get('lead', 0))
+    add_to_cart = safe_int(actions.get('add_to_cart', 0))
+    link_click = safe_int(actions.get('link_click', 0))
 
     # 전환 가치
-    purchase_value = extract_action_values(action_values, 'purchase')
-    total_conversion_value = extract_action_values(action_values, 'omni_purchase')
+    purchase_value = safe_float(action_values.get('purchase', 0))
+    total_conversion_value = safe_float(action_values.get('omni_purchase', 0))
 
     # 총 전환 수 (purchase + lead)
     total_conversions = purchase + lead
@@ -154,18 +194,22 @@ def process_campaigns(campaigns):
     """모든 캠페인 데이터 처리"""
     print(f"📊 {len(campaigns)}개 캠페인 처리 중...")
 
-    processed_campaigns = []
-    for campaign in campaigns:
-        metrics = calculate_metrics(campaign)
-        processed_campaigns.append(metrics)
+    processed_campaigns = [calculate_metrics(campaign) for campaign in campaigns]
 
     # 지출 순으로 정렬
-    processed_campaigns.sort(key=lambda x: x['spend'], reverse=True)
+    processed_campaigns.sort(key=by_spend, reverse=True)
 
     print(f"   ✅ 캠페인 처리 완료")
     return processed_campaigns
 
 
+# 오디언스 breakdown 차원 (segment에서 같은 이름의 키로 값이 들어옴)
+AUDIENCE_DIMENSIONS = ('age', 'gender', 'region')
+
+# 리포트에 남길 상위 지역 수 (나머지는 Notion에 표시되지 않으므로 저장하지 않음)
+TOP_REGIONS = 10
+
+
 def process_audience_data(audience_data):
     """오디언스 데이터를 캠페인별로 그룹화하여 처리"""
     print("📊 오디언스 데이터 처리 중...")
@@ -173,35 +217,25 @@ def process_audience_data(audience_data):
     # 캠페인별 그룹화
     by_campaign: dict[str, dict] = {}
 
-    for breakdown_type in ('age', 'gender', 'region'):
-        for segment in audience_data.get(breakdown_type, []):
+    for dimension in AUDIENCE_DIMENSIONS:
+        for segment in audience_data.get(dimension, []):
             cid = segment.get('campaign_id', 'unknown')
             if cid not in by_campaign:
-                by_campaign[cid] = {
-                    'campaign_name': segment.get('campaign_name', ''),
-                    'age': [], 'gender': [], 'region': []
-                }
+                by_campaign[cid] = {'campaign_name': segment.get('campaign_name', '')}
+                by_campaign[cid].update((dim, []) for dim in AUDIENCE_DIMENSIONS)
 
-            entry = {
+            by_campaign[cid][dimension].append({
                 'impressions': safe_int(segment.get('impressions', 0)),
                 'clicks': safe_int(segment.get('clicks', 0)),
                 'spend': round(safe_float(segment.get('spend', 0)), 2),
-            }
-
-            if breakdown_type == 'age':
-                entry['age'] = segment.get('age', 'Unknown')
-            elif breakdown_type == 'gender':
-                entry['gender'] = segment.get('gender', 'Unknown')
-            elif breakdown_type == 'region':
-                entry['region'] = segment.get('region', 'Unknown')
-
-            by_campaign[cid][breakdown_type].append(entry)
+                dimension: segment.get(dimension, 'Unknown'),
+            })
 
     # 각 캠페인 내 지출 순 정렬
-    for cid, data in by_campaign.items():
-        data['age'].sort(key=lambda x: x['spend'], reverse=True)
-        data['gender'].sort(key=lambda x: x['spend'], reverse=True)
-        data['region'].sort(key=lambda x: x['spend'], reverse=True)
+    for data in by_campaign.values():
+        for dimension in AUDIENCE_DIMENSIONS:
+            data[dimension].sort(key=by_spend, reverse=True)
+        del data['region'][TOP_REGIONS:]
 
     print(f"   ✅ 오디언스 데이터 처리 완료 ({len(by_campaign)}개 캠페인)")
     return by_campaign
@@ -223,9 +257,9 @@ def process_adset_data(raw_adsets):
         spend = round(safe_float(adset.get('spend', 0)), 2)
 
         # 전환 추출
-        actions = adset.get('actions', [])
-        lead = extract_actions(actions, 'lead')
-        purchase = extract_actions(actions, 'purchase')
+        actions = _action_map(adset.get('actions', []))
+        lead = safe_int(actions.get('lead', 0))
+        purchase = safe_int(actions.get('purchase', 0))
         total_conversions = lead + purchase
 
         by_campaign[cid].append({
@@ -245,7 +279,7 @@ def process_adset_data(raw_adsets):
 
     # 각 캠페인 내 지출 순 정렬
     for cid in by_campaign:
-        by_campaign[cid].sort(key=lambda x: x['spend'], reverse=True)
+        by_campaign[cid].sort(key=by_spend, reverse=True)
 
     total = sum(len(v) for v in by_campaign.values())
     print(f"   ✅ AdSet 데이터 처리 완료 ({total}개 AdSet, {len(by_campaign)}개 캠페인)")
@@ -268,9 +302,9 @@ def process_ad_data(raw_ads):
         spend = round(safe_float(ad.get('spend', 0)), 2)
 
         # 전환 추출
-        actions = ad.get('actions', [])
-        lead = extract_actions(actions, 'lead')
-        purchase = extract_actions(actions, 'purchase')
+        actions = _action_map(ad.get('actions', []))
+        lead = safe_int(actions.get('lead', 0))
+        purchase = safe_int(actions.get('purchase', 0))
         total_conversions = lead + purchase
 
         by_campaign[cid].append({
@@ -289,7 +323,7 @@ def process_ad_data(raw_ads):
 
     # 각 캠페인 내 지출 순 정렬
     for cid in by_campaign:
-        by_campaign[cid].sort(key=lambda x: x['spend'], reverse=True)
+        by_campaign[cid].sort(key=by_spend, reverse=True)
 
     total = sum(len(v) for v in by_campaign.values())
     print(f"   ✅ Ad 데이터 처리 완료 ({total}개 Ad, {len(by_campaign)}개 캠페인)")
@@ -300,9 +334,14 @@ def calculate_summary(processed_campaigns, notion_leads_count=0):
     """주간 요약 통계 계산"""
     print("📊 주간 요약 계산 중...")
 
-    total_spend = sum(c['spend'] for c in processed_campaigns)
-    total_impressions = sum(c['impressions'] for c in processed_campaigns)
-    total_clicks = sum(c['clicks'] for c in processed_campaigns)
+    # 캠페인 목록을 한 번만 순회하며 합산
+    total_spend = 0
+    total_impressions = 0
+    total_clicks = 0
+    for c in processed_campaigns:
+        total_spend += c['spend']
+        total_impressions += c['impressions']
+        total_clicks += c['clicks']
 
     # 🔥 실제 전환 = Notion 문의 수
     total_conversions = notion_leads_count
@@ -338,18 +377,33 @@ def calculate_summary(processed_campaigns, notion_leads_count=0):
     return summary
 
 
-def save_processed_data(data, filename):
-    """처리된 데이터를 JSON 파일로 저장"""
+def save_processed_data(data, filename, pretty=False):
+    """처리된 데이터를 JSON 파일로 저장
+
+    기본은 공백 없는 compact JSON이고, pretty=True일 때만 들여쓰기합니다.
+    임시 파일에 쓴 뒤 os.replace로 교체하여 중간에 중단돼도 반쯤 쓰인 파일이 남지 않습니다.
+    """
     output_path = os.path.join(PROJECT_ROOT, 'data', 'processed', filename)
+    tmp_path = output_path + '.tmp'
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        if pretty:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        else:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, output_path)
+
+    # 최신 파일 포인터 갱신 (같은 방식으로 원자적 교체)
+    pointer_path = os.path.join(os.path.dirname(output_path), LATEST_POINTER)
+    with open(pointer_path + '.tmp', 'w', encoding='utf-8') as f:
+        f.write(filename)
+    os.replace(pointer_path + '.tmp', pointer_path)
 
     print(f"💾 처리된 데이터 저장: {output_path}")
     return output_path
 
 
-def main():
+def main(pretty=False):
     """메인 실행 함수"""
     try:
         print("=" * 60)
@@ -378,9 +432,9 @@ def main():
         # 캠페인에 오디언스 + AdSet + Ad 데이터 매핑
         for campaign in processed_campaigns:
             cid = campaign['campaign_id']
-            campaign['audience'] = audience_by_campaign.get(cid, {
-                'age': [], 'gender': [], 'region': []
-            })
+            campaign['audience'] = audience_by_campaign.get(cid) or {
+                dim: [] for dim in AUDIENCE_DIMENSIONS
+            }
             campaign['adsets'] = adset_by_campaign.get(cid, [])
             campaign['ads'] = ad_by_campaign.get(cid, [])
 
@@ -403,7 +457,7 @@ def main():
         filename = f"weekly_report_{datetime.now().strftime('%Y-%m-%d')}.json"
 
         # 저장
-        output_path = save_processed_data(processed_data, filename)
+        output_path = save_processed_data(processed_data, filename, pretty=pretty)
 
         print("=" * 60)
         print("✅ 데이터 처리 완료!")
@@ -420,4 +474,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description='Meta Ads 데이터 처리')
+    parser.add_argument('--pretty', action='store_true', help='들여쓰기된 JSON으로 저장 (디버깅용)')
+    args = parser.parse_args()
+
+    main(pretty=args.pretty)
@@ -10,16 +10,27 @@ import sys
 import time
 import logging
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from dotenv import load_dotenv
-import requests
+from functools import lru_cache
 
 # 프로젝트 루트 디렉토리
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
 
+# scripts/ 디렉토리 (각 단계 모듈 import용, 한 번만 추가)
+SCRIPTS_DIR = os.path.join(PROJECT_ROOT, 'scripts')
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
 # 환경 변수 로드
-load_dotenv(os.path.join(PROJECT_ROOT, '.env'))
+import _config
+from _retry import backoff_delay
+
+_config.load_env()
+
+# Slack 웹훅 URL (.env 로드 직후 한 번만 읽음, 없으면 알림 생략)
+SLACK_WEBHOOK_URL = os.getenv('SLACK_WEBHOOK_URL')
 
 # 로깅 설정
 log_dir = os.path.join(PROJECT_ROOT, 'logs')
@@ -37,11 +48,39 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+BANNER = "=" * 60
+
+
+def log_step_banner(title):
+    """단계 시작 배너를 한 레코드로 기록 (병렬 단계끼리 줄이 섞이지 않도록)"""
+    logger.info("%s\n%s\n%s", BANNER, title, BANNER)
+
+
+@lru_cache(maxsize=1)
+def get_slack_session():
+    """Slack 웹훅용 requests.Session (커넥션 재사용 + 일시 오류 재시도)
+
+    requests는 알림을 실제로 보낼 때만 import합니다.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=['POST'],  # 웹훅은 POST라 기본 허용 목록에 없음
+        raise_on_status=False,
+    )
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry))
+    return session
+
 
 def send_slack_notification(message, is_error=False):
     """Slack 웹훅으로 알림 전송"""
-    webhook_url = os.getenv('SLACK_WEBHOOK_URL')
-    if not webhook_url:
+    if not SLACK_WEBHOOK_URL:
         logger.warning("SLACK_WEBHOOK_URL이 설정되지 않아 Slack 알림을 건너뜁니다.")
         return
 
@@ -66,42 +105,41 @@ def send_slack_notification(message, is_error=False):
     }
 
     try:
-        response = requests.post(webhook_url, json=payload, timeout=10)
+        response = get_slack_session().post(SLACK_WEBHOOK_URL, json=payload, timeout=10)
         if response.status_code == 200:
             logger.info("Slack 알림 전송 완료")
         else:
-            logger.warning(f"Slack 알림 전송 실패: {response.status_code}")
+            logger.warning("Slack 알림 전송 실패: %s", response.status_code)
     except Exception as e:
-        logger.warning(f"Slack 알림 전송 중 에러: {e}")
+        logger.warning("Slack 알림 전송 중 에러: %s", e)
 
 
-def retry_on_failure(func, max_retries=3, retry_interval=60):
-    """재시도 로직"""
+def retry_on_failure(func, max_retries=4, base_delay=1.0, max_delay=60.0):
+    """재시도 로직 (지수 백오프 + jitter: 약 1, 2, 4초 ... 최대 max_delay초)"""
     for attempt in range(1, max_retries + 1):
         try:
-            logger.info(f"시도 {attempt}/{max_retries}: {func.__name__}")
+            logger.info("시도 %d/%d: %s", attempt, max_retries, func.__name__)
+            started = time.time()
             result = func()
-            logger.info(f"✅ {func.__name__} 성공")
+            logger.info("✅ %s 성공 (%.1f초)", func.__name__, time.time() - started)
             return result
         except Exception as e:
-            logger.error(f"❌ {func.__name__} 실패 (시도 {attempt}/{max_retries}): {e}")
+            logger.error("❌ %s 실패 (시도 %d/%d): %s", func.__name__, attempt, max_retries, e)
 
             if attempt < max_retries:
-                logger.info(f"   {retry_interval}초 후 재시도...")
-                time.sleep(retry_interval)
+                delay = backoff_delay(None, attempt, base_delay, max_delay)
+                logger.info("   %.1f초 후 재시도...", delay)
+                time.sleep(delay)
             else:
-                logger.error(f"   최대 재시도 횟수 초과. 실패.")
+                logger.error("   최대 재시도 횟수 초과. 실패.")
                 raise
 
 
 def step1_fetch_meta_data():
     """Step 1: Meta API 데이터 수집"""
-    logger.info("=" * 60)
-    logger.info("Step 1: Meta API 데이터 수집")
-    logger.info("=" * 60)
+    log_step_banner("Step 1: Meta API 데이터 수집")
 
     # fetch_meta_ads 모듈 import
-    sys.path.insert(0, os.path.join(PROJECT_ROOT, 'scripts'))
     import fetch_meta_ads
 
     # 메인 함수 실행
@@ -111,12 +149,9 @@ def step1_fetch_meta_data():
 
 def step2_fetch_notion_leads():
     """Step 2: Notion 문의 데이터 수집"""
-    logger.info("=" * 60)
-    logger.info("Step 2: Notion 문의 데이터 수집")
-    logger.info("=" * 60)
+    log_step_banner("Step 2: Notion 문의 데이터 수집")
 
     # fetch_notion_leads 모듈 import
-    sys.path.insert(0, os.path.join(PROJECT_ROOT, 'scripts'))
     import fetch_notion_leads
 
     # 날짜 범위 설정 (전주 월~일)
@@ -144,12 +179,9 @@ def step2_fetch_notion_leads():
 
 def step3_process_data():
     """Step 3: 데이터 처리"""
-    logger.info("=" * 60)
-    logger.info("Step 3: 데이터 처리")
-    logger.info("=" * 60)
+    log_step_banner("Step 3: 데이터 처리")
 
     # process_data 모듈 import
-    sys.path.insert(0, os.path.join(PROJECT_ROOT, 'scripts'))
     import process_data
 
     # 메인 함수 실행
@@ -159,12 +191,9 @@ def step3_process_data():
 
 def step4_send_to_notion():
     """Step 4: Notion 업데이트"""
-    logger.info("=" * 60)
-    logger.info("Step 4: Notion 업데이트")
-    logger.info("=" * 60)
+    log_step_banner("Step 4: Notion 업데이트")
 
     # send_to_notion 모듈 import
-    sys.path.insert(0, os.path.join(PROJECT_ROOT, 'scripts'))
     import send_to_notion
 
     # 메인 함수 실행
@@ -172,18 +201,38 @@ def step4_send_to_notion():
     return page_url
 
 
-def validate_environment():
-    """환경 변수 검증"""
-    required_vars = [
-        'META_ACCESS_TOKEN',
-        'META_AD_ACCOUNT_ID',
-        'NOTION_TOKEN',
-        'NOTION_PARENT_PAGE_ID'
-    ]
+def run_fetch_steps():
+    """Step 1, 2 병렬 실행 (Meta API와 Notion API는 서로 독립적)
+
+    둘 다 네트워크 대기 위주라 스레드로 겹쳐 실행하면
+    소요 시간이 t1 + t2 대신 max(t1, t2)가 됩니다.
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = {
+            executor.submit(retry_on_failure, step1_fetch_meta_data): 'meta',
+            executor.submit(retry_on_failure, step2_fetch_notion_leads): 'leads',
+        }
+        results = {}
+        # 먼저 실패한 단계의 예외를 그대로 전파
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+
+    return results['meta'], results['leads']
+
+
+# 파이프라인 실행에 필요한 환경 변수
+REQUIRED_ENV_VARS = (
+    'META_ACCESS_TOKEN',
+    'META_AD_ACCOUNT_ID',
+    'NOTION_TOKEN',
+    'NOTION_PARENT_PAGE_ID',
+)
 
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
 
-    if missing_vars:
+def validate_environment():
+    """환경 변수 검증"""
+    if not all(os.getenv(var) for var in REQUIRED_ENV_VARS):
+        missing_vars = [var for var in REQUIRED_ENV_VARS if not os.getenv(var)]
         raise ValueError(
             f"다음 환경 변수가 .env에 설정되어야 합니다: {', '.join(missing_vars)}"
         )
@@ -196,19 +245,16 @@ def main():
     start_time = time.time()
 
     try:
-        logger.info("=" * 60)
+        logger.info(BANNER)
         logger.info("Meta Ads Weekly Report 자동화 시작")
-        logger.info(f"실행 시각: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        logger.info("=" * 60)
+        logger.info("실행 시각: %s", datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        logger.info(BANNER)
 
         # 환경 변수 검증
         validate_environment()
 
-        # Step 1: Meta 데이터 수집 (재시도 포함)
-        raw_data_path = retry_on_failure(step1_fetch_meta_data)
-
-        # Step 2: Notion 문의 데이터 수집 (재시도 포함)
-        notion_leads_path = retry_on_failure(step2_fetch_notion_leads)
+        # Step 1, 2: Meta 데이터 + Notion 문의 데이터 병렬 수집 (각각 재시도 포함)
+        raw_data_path, notion_leads_path = run_fetch_steps()
 
         # Step 3: 데이터 처리 (재시도 포함)
         processed_data_path = retry_on_failure(step3_process_data)
@@ -228,11 +274,11 @@ def main():
             f"Notion: {notion_page_url}"
         )
 
-        logger.info("=" * 60)
+        logger.info(BANNER)
         logger.info("✅ 자동화 완료!")
-        logger.info(f"   소요 시간: {elapsed_minutes}분 {elapsed_seconds}초")
-        logger.info(f"   Notion URL: {notion_page_url}")
-        logger.info("=" * 60)
+        logger.info("   소요 시간: %d분 %d초", elapsed_minutes, elapsed_seconds)
+        logger.info("   Notion URL: %s", notion_page_url)
+        logger.info(BANNER)
 
         # Slack 알림 (성공)
         send_slack_notification(success_message, is_error=False)
@@ -252,10 +298,10 @@ def main():
             f"에러: {str(e)}"
         )
 
-        logger.error("=" * 60)
+        logger.error(BANNER)
         logger.error("❌ 자동화 실패!")
-        logger.error(f"   에러: {e}")
-        logger.error("=" * 60)
+        logger.error("   에러: %s", e)
+        logger.error(BANNER)
 
         # Slack 알림 (실패)
         send_slack_notification(error_message, is_error=True)
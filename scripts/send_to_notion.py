@@ -8,17 +8,41 @@ Notion 리포트 업데이트 스크립트
 import os
 import sys
 import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from pathlib import Path
-from dotenv import load_dotenv
-from notion_client import Client
+from heapq import nlargest
+
+import _config
+import _notion
+from process_data import LATEST_POINTER, by_spend, find_latest_file
 
 # 프로젝트 루트 디렉토리
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
 
 # 환경 변수 로드
-load_dotenv(os.path.join(PROJECT_ROOT, '.env'))
+_config.load_env()
+
+
+# Notion API 요청 1회당 children 최대 개수
+NOTION_MAX_CHILDREN = 100
+
+# 기존 블록 삭제 동시 요청 수
+MAX_DELETE_WORKERS = 3
+
+# 캠페인 페이지 동시 처리 수 (요청 속도는 클라이언트의 토큰 버킷이 제한)
+MAX_PAGE_WORKERS = 5
+
+# 리포트 DB에 있어야 하는 속성 (없으면 추가)
+CONTENT_HASH_PROPERTY = "콘텐츠 해시"
+REQUIRED_PROPERTIES = {
+    "캠페인명": {"select": {}},
+    CONTENT_HASH_PROPERTY: {"rich_text": {}},  # 변경 없는 페이지 재작성 방지용
+}
+
+# 기존 리포트 조회 시 받아올 속성 (나머지 속성은 응답에서 제외)
+EXISTING_REPORT_PROPERTIES = ("리포트 제목", "총 전환수", CONTENT_HASH_PROPERTY)
 
 
 # ── 소재 판정 로직 ──────────────────────────────────────────
@@ -32,6 +56,9 @@ TARGET_CPC = 2.0      # USD, 2배 초과($4.0) 시 KILL
 WATCH_FREQUENCY = 2.0
 KILL_FREQUENCY = 3.0
 
+# 판정별 표시 색상
+VERDICT_COLORS = {'WINNING': 'green', 'WATCH': 'yellow', 'KILL': 'red'}
+
 
 def judge_ad(ad):
     """소재 성과 판정. 반환: 'WINNING' | 'WATCH' | 'KILL' | None(데이터 부족)"""
@@ -57,29 +84,33 @@ def judge_ad(ad):
 
 def load_config():
     """config.json에서 database_id 로드"""
-    config_path = os.path.join(PROJECT_ROOT, 'config', 'config.json')
+    return _config.load_config().get('notion_database_id')
 
-    if not os.path.exists(config_path):
-        raise FileNotFoundError(
-            "config.json 파일이 없습니다.\n"
-            "먼저 create_notion_db.py를 실행하여 데이터베이스를 생성하세요."
-        )
 
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = json.load(f)
+def _read_latest_pointer(processed_dir):
+    """LATEST 포인터가 가리키는 파일 경로 (포인터가 없거나 대상 파일이 없으면 None)"""
+    try:
+        with open(os.path.join(processed_dir, LATEST_POINTER), 'r', encoding='utf-8') as f:
+            filename = f.read().strip()
+    except FileNotFoundError:
+        return None
 
-    return config.get('notion_database_id')
+    path = os.path.join(processed_dir, filename)
+    return path if filename and os.path.isfile(path) else None
 
 
 def get_latest_processed_data():
     """data/processed/에서 가장 최근 처리된 데이터 로드"""
     processed_dir = os.path.join(PROJECT_ROOT, 'data', 'processed')
-    json_files = list(Path(processed_dir).glob('weekly_report_*.json'))
+    latest_file = _read_latest_pointer(processed_dir)
+
+    # 포인터가 없으면(이전 버전 데이터) 디렉토리 스캔
+    if latest_file is None:
+        latest_file = find_latest_file(processed_dir, 'weekly_report_', suffixes=('.json',))
 
-    if not json_files:
-        raise FileNotFoundError("data/processed/ 디렉토리에 처리된 데이터 파일이 없습니다.")
+        if latest_file is None:
+            raise FileNotFoundError("data/processed/ 디렉토리에 처리된 데이터 파일이 없습니다.")
 
-    latest_file = max(json_files, key=lambda p: p.stat().st_mtime)
     print(f"📂 처리된 데이터 로드: {latest_file}")
 
     with open(latest_file, 'r', encoding='utf-8') as f:
@@ -88,16 +119,56 @@ def get_latest_processed_data():
     return data
 
 
-def ensure_campaign_property(notion, database_id):
-    """DB에 '캠페인명' 속성이 없으면 추가"""
+def ensure_database_properties(notion, database_id):
+    """DB에 REQUIRED_PROPERTIES 중 없는 속성이 있으면 한 번에 추가
+
+    반환: {속성명: 속성 ID} (조회 시 filter_properties에 사용)
+    PAGE_PROPERTIES 중 DB에 없는 속성이 있으면 캠페인마다 API 400을 받기 전에 ValueError를 발생시킵니다.
+    속성 ID는 config.json의 notion_property_ids에 저장해 두고 다음 실행부터는 스키마 조회를 생략합니다.
+    DB 속성을 직접 삭제/변경했다면 config.json에서 notion_property_ids를 지우면 다시 조회합니다.
+    """
+    cached = _config.load_config().get('notion_property_ids') or {}
+    if all(name in cached for name in PAGE_PROPERTIES):
+        return cached
+
     db = notion.databases.retrieve(database_id=database_id)
-    if "캠페인명" not in db.get("properties", {}):
-        print("📝 DB에 '캠페인명' 속성 추가 중...")
-        notion.databases.update(
-            database_id=database_id,
-            properties={"캠페인명": {"select": {}}}
-        )
-        print("   ✅ '캠페인명' 속성 추가 완료")
+    existing = db.get("properties", {})
+    missing = {name: schema for name, schema in REQUIRED_PROPERTIES.items() if name not in existing}
+
+    if missing:
+        names = ", ".join(f"'{name}'" for name in missing)
+        print(f"📝 DB에 {names} 속성 추가 중...")
+        db = notion.databases.update(database_id=database_id, properties=missing)
+        print(f"   ✅ {names} 속성 추가 완료")
+
+    property_ids = {name: prop["id"] for name, prop in db.get("properties", {}).items()}
+    unknown = [name for name in PAGE_PROPERTIES if name not in property_ids]
+    if unknown:
+        raise ValueError(f"Notion DB에 다음 속성이 없습니다: {', '.join(unknown)}")
+
+    _config.update_config(notion_property_ids=property_ids)
+    return property_ids
+
+
+# 캠페인 값을 그대로 기록하는 number 속성: (Notion 속성명, campaign 키)
+CAMPAIGN_NUMBER_PROPERTIES = (
+    ("총 지출", 'spend'),
+    ("총 노출", 'impressions'),
+    ("총 클릭", 'clicks'),
+    ("평균 CPC", 'cpc'),
+)
+
+# 리포트 페이지에 기록하는 전체 속성 (REQUIRED_PROPERTIES, EXISTING_REPORT_PROPERTIES 포함)
+PAGE_PROPERTIES = (
+    "리포트 제목", "기간", "캠페인명",
+    *(name for name, _ in CAMPAIGN_NUMBER_PROPERTIES),
+    "평균 CTR", "평균 CPA", "총 전환수", "상태", CONTENT_HASH_PROPERTY,
+)
+
+
+def report_title(campaign_name):
+    """캠페인명 → 리포트 제목 ("새 OO 캠페인" → "OO")"""
+    return campaign_name.replace("새 ", "").replace(" 캠페인", "")
 
 
 def create_campaign_page_properties(campaign, date_range, manual_conversions=None):
@@ -107,8 +178,7 @@ def create_campaign_page_properties(campaign, date_range, manual_conversions=Non
     manual_conversions가 제공되면 CPA를 재계산합니다.
     """
     name = campaign['campaign_name']
-    short_name = name.replace("새 ", "").replace(" 캠페인", "")
-    week_title = short_name
+    week_title = report_title(name)
 
     props = {
         "리포트 제목": {
@@ -120,13 +190,11 @@ def create_campaign_page_properties(campaign, date_range, manual_conversions=Non
         "캠페인명": {
             "select": {"name": name}
         },
-        "총 지출": {"number": campaign['spend']},
-        "총 노출": {"number": campaign['impressions']},
-        "총 클릭": {"number": campaign['clicks']},
-        "평균 CPC": {"number": campaign['cpc']},
-        "평균 CTR": {"number": campaign['ctr'] / 100 if campaign['ctr'] > 1 else campaign['ctr']},
-        "상태": {"select": {"name": "완료"}},
     }
+    props.update((key, {"number": campaign[field]}) for key, field in CAMPAIGN_NUMBER_PROPERTIES)
+    # CTR은 Notion 퍼센트 형식에 맞게 비율로 변환
+    props["평균 CTR"] = {"number": campaign['ctr'] / 100 if campaign['ctr'] > 1 else campaign['ctr']}
+    props["상태"] = {"select": {"name": "완료"}}
 
     # 수동 전환수가 있으면 CPA 재계산
     if manual_conversions is not None:
@@ -148,12 +216,26 @@ def _text(content, bold=False, color="default"):
     return t
 
 
-def _table_row(cells):
-    """테이블 행 블록 헬퍼"""
+def _table_row(cells, bold=False):
+    """테이블 행 블록 헬퍼 (bold=True면 헤더 행)"""
     return {
         "object": "block",
         "type": "table_row",
-        "table_row": {"cells": [[_text(c)] for c in cells]}
+        "table_row": {"cells": [[_text(c, bold=bold)] for c in cells]}
+    }
+
+
+def _table(width, rows):
+    """테이블 블록 헬퍼 (첫 행은 열 헤더)"""
+    return {
+        "object": "block",
+        "type": "table",
+        "table": {
+            "table_width": width,
+            "has_column_header": True,
+            "has_row_header": False,
+            "children": rows
+        }
     }
 
 
@@ -167,6 +249,45 @@ def _heading(level, text):
     }
 
 
+# ── 오디언스 테이블 고정 블록 ──
+# 모듈 로드 시 한 번만 생성 (블록은 요청 본문으로 직렬화만 되고 수정되지 않음)
+GENDER_LABELS = {"male": "남성", "female": "여성", "unknown": "미분류"}
+
+AUDIENCE_HEADINGS = {
+    'age': _heading(2, "👥 연령대별 분석"),
+    'gender': _heading(2, "🚻 성별 분석"),
+    'region': _heading(2, "📍 지역별 분석"),
+}
+
+AUDIENCE_HEADER_ROWS = {
+    dim: _table_row([label, "지출", "노출", "클릭"], bold=True)
+    for dim, label in (('age', "연령대"), ('gender', "성별"), ('region', "지역"))
+}
+
+# 세그먼트 값 → 표시 라벨 (없는 차원은 값 그대로 표시)
+AUDIENCE_LABELS = {'gender': GENDER_LABELS}
+
+# 차원별 최대 행 수 (상위 10개 지역, 이전 리포트 파일 호환)
+AUDIENCE_MAX_ROWS = {'region': 10}
+
+
+def _audience_table(dimension, segments):
+    """오디언스 차원별 헤딩 + 세그먼트 테이블 블록"""
+    labels = AUDIENCE_LABELS.get(dimension, {})
+    rows = [AUDIENCE_HEADER_ROWS[dimension]] + [
+        _table_row([labels.get(s[dimension], s[dimension]), f"${s['spend']:,.2f}", f"{s['impressions']:,}", f"{s['clicks']:,}"])
+        for s in segments[:AUDIENCE_MAX_ROWS.get(dimension)]
+    ]
+    return [AUDIENCE_HEADINGS[dimension], _table(4, rows)]
+
+
+# ── 성과/AdSet/소재 테이블 헤더 행 ──
+# 오디언스 헤더와 마찬가지로 모듈 로드 시 한 번만 생성
+METRIC_HEADER_ROW = _table_row(["메트릭", "값"], bold=True)
+ADSET_HEADER_ROW = _table_row(["AdSet", "지출", "노출", "클릭", "CPC", "CTR", "전환"], bold=True)
+AD_HEADER_ROW = _table_row(["소재", "지출", "노출", "클릭", "CPC", "CTR", "전환", "판정"], bold=True)
+
+
 def create_campaign_content_blocks(campaign, manual_conversions=None):
     """캠페인 페이지 본문 블록 생성
 
@@ -177,8 +298,9 @@ def create_campaign_content_blocks(campaign, manual_conversions=None):
     # ── 성과 요약 테이블 ──
     blocks.append(_heading(2, "📊 성과 요약"))
 
+    spend = campaign['spend']
     metrics = [
-        ("지출", f"${campaign['spend']:,.2f}"),
+        ("지출", f"${spend:,.2f}"),
         ("노출", f"{campaign['impressions']:,}회"),
         ("클릭", f"{campaign['clicks']:,}회"),
         ("도달", f"{campaign['reach']:,}명"),
@@ -189,91 +311,20 @@ def create_campaign_content_blocks(campaign, manual_conversions=None):
 
     # 수동 전환수가 있으면 전환/CPA 표시
     if manual_conversions is not None:
-        cpa = campaign['spend'] / manual_conversions if manual_conversions > 0 else 0
-        metrics.append(("전환", f"{manual_conversions}건"))
-        metrics.append(("CPA", f"${cpa:,.2f}"))
+        cpa = spend / manual_conversions if manual_conversions > 0 else 0
+        metrics += [("전환", f"{manual_conversions}건"), ("CPA", f"${cpa:,.2f}")]
         # 인사이트에서 사용할 수 있도록 campaign에 임시 저장
         campaign['_manual_conversions'] = manual_conversions
         campaign['_manual_cpa'] = round(cpa, 2)
 
-    header_row = {
-        "object": "block",
-        "type": "table_row",
-        "table_row": {"cells": [[_text("메트릭", bold=True)], [_text("값", bold=True)]]}
-    }
-    metric_rows = [header_row] + [_table_row([m, v]) for m, v in metrics]
-
-    blocks.append({
-        "object": "block",
-        "type": "table",
-        "table": {
-            "table_width": 2,
-            "has_column_header": True,
-            "has_row_header": False,
-            "children": metric_rows
-        }
-    })
+    metric_rows = [METRIC_HEADER_ROW] + [_table_row([m, v]) for m, v in metrics]
+    blocks.append(_table(2, metric_rows))
 
     # ── 오디언스 인사이트 ──
     audience = campaign.get('audience', {})
-
-    if audience.get('age'):
-        blocks.append(_heading(2, "👥 연령대별 분석"))
-        age_header = {
-            "object": "block",
-            "type": "table_row",
-            "table_row": {"cells": [
-                [_text("연령대", bold=True)], [_text("지출", bold=True)],
-                [_text("노출", bold=True)], [_text("클릭", bold=True)]
-            ]}
-        }
-        age_rows = [age_header] + [
-            _table_row([s['age'], f"${s['spend']:,.2f}", f"{s['impressions']:,}", f"{s['clicks']:,}"])
-            for s in audience['age']
-        ]
-        blocks.append({
-            "object": "block", "type": "table",
-            "table": {"table_width": 4, "has_column_header": True, "has_row_header": False, "children": age_rows}
-        })
-
-    if audience.get('gender'):
-        blocks.append(_heading(2, "🚻 성별 분석"))
-        gender_map = {"male": "남성", "female": "여성", "unknown": "미분류"}
-        g_header = {
-            "object": "block",
-            "type": "table_row",
-            "table_row": {"cells": [
-                [_text("성별", bold=True)], [_text("지출", bold=True)],
-                [_text("노출", bold=True)], [_text("클릭", bold=True)]
-            ]}
-        }
-        g_rows = [g_header] + [
-            _table_row([gender_map.get(s['gender'], s['gender']), f"${s['spend']:,.2f}", f"{s['impressions']:,}", f"{s['clicks']:,}"])
-            for s in audience['gender']
-        ]
-        blocks.append({
-            "object": "block", "type": "table",
-            "table": {"table_width": 4, "has_column_header": True, "has_row_header": False, "children": g_rows}
-        })
-
-    if audience.get('region'):
-        blocks.append(_heading(2, "📍 지역별 분석"))
-        r_header = {
-            "object": "block",
-            "type": "table_row",
-            "table_row": {"cells": [
-                [_text("지역", bold=True)], [_text("지출", bold=True)],
-                [_text("노출", bold=True)], [_text("클릭", bold=True)]
-            ]}
-        }
-        r_rows = [r_header] + [
-            _table_row([s['region'], f"${s['spend']:,.2f}", f"{s['impressions']:,}", f"{s['clicks']:,}"])
-            for s in audience['region'][:10]  # 상위 10개 지역
-        ]
-        blocks.append({
-            "object": "block", "type": "table",
-            "table": {"table_width": 4, "has_column_header": True, "has_row_header": False, "children": r_rows}
-        })
+    for dimension in AUDIENCE_HEADINGS:  # 연령대 → 성별 → 지역 순
+        if audience.get(dimension):
+            blocks.extend(_audience_table(dimension, audience[dimension]))
 
     # ── AdSet별 성과 ──
     blocks.extend(create_adset_blocks(campaign.get('adsets', [])))
@@ -294,19 +345,8 @@ def create_adset_blocks(adsets):
 
     blocks = [_heading(2, "📋 AdSet별 성과")]
 
-    header = {
-        "object": "block",
-        "type": "table_row",
-        "table_row": {"cells": [
-            [_text("AdSet", bold=True)], [_text("지출", bold=True)],
-            [_text("노출", bold=True)], [_text("클릭", bold=True)],
-            [_text("CPC", bold=True)], [_text("CTR", bold=True)],
-            [_text("전환", bold=True)],
-        ]}
-    }
-    rows = [header]
-    for a in adsets:
-        rows.append(_table_row([
+    rows = [ADSET_HEADER_ROW] + [
+        _table_row([
             a['adset_name'],
             f"${a['spend']:,.2f}",
             f"{a['impressions']:,}",
@@ -314,15 +354,32 @@ def create_adset_blocks(adsets):
             f"${a['cpc']:.2f}",
             f"{a['ctr']:.2f}%",
             str(a.get('conversions', 0)),
-        ]))
+        ])
+        for a in adsets
+    ]
 
-    blocks.append({
-        "object": "block", "type": "table",
-        "table": {"table_width": 7, "has_column_header": True, "has_row_header": False, "children": rows}
-    })
+    blocks.append(_table(7, rows))
     return blocks
 
 
+def _ad_row(ad):
+    """소재 테이블 행 (마지막 판정 셀은 색상 강조)"""
+    row = _table_row([
+        ad['ad_name'],
+        f"${ad['spend']:,.2f}",
+        f"{ad['impressions']:,}",
+        f"{ad['clicks']:,}",
+        f"${ad['cpc']:.2f}",
+        f"{ad['ctr']:.2f}%",
+        str(ad.get('conversions', 0)),
+    ])
+    verdict = ad['verdict']
+    row["table_row"]["cells"].append(
+        [_text(verdict, bold=True, color=VERDICT_COLORS.get(verdict, 'default'))]
+    )
+    return row
+
+
 def create_ad_blocks(ads):
     """소재별 성과 테이블 블록 생성 (판정 포함)"""
     if not ads:
@@ -341,54 +398,43 @@ def create_ad_blocks(ads):
 
     blocks = [_heading(2, "🎨 소재별 성과")]
 
-    header = {
-        "object": "block",
-        "type": "table_row",
-        "table_row": {"cells": [
-            [_text("소재", bold=True)], [_text("지출", bold=True)],
-            [_text("노출", bold=True)], [_text("클릭", bold=True)],
-            [_text("CPC", bold=True)], [_text("CTR", bold=True)],
-            [_text("전환", bold=True)], [_text("판정", bold=True)],
-        ]}
-    }
-    rows = [header]
-    for ad in judged:
-        verdict = ad['verdict']
-        verdict_color = {'WINNING': 'green', 'WATCH': 'yellow', 'KILL': 'red'}.get(verdict, 'default')
-        verdict_cell = [_text(verdict, bold=True, color=verdict_color)]
-
-        row = {
-            "object": "block",
-            "type": "table_row",
-            "table_row": {"cells": [
-                [_text(ad['ad_name'])],
-                [_text(f"${ad['spend']:,.2f}")],
-                [_text(f"{ad['impressions']:,}")],
-                [_text(f"{ad['clicks']:,}")],
-                [_text(f"${ad['cpc']:.2f}")],
-                [_text(f"{ad['ctr']:.2f}%")],
-                [_text(str(ad.get('conversions', 0)))],
-                verdict_cell,
-            ]}
-        }
-        rows.append(row)
+    rows = [AD_HEADER_ROW] + [_ad_row(ad) for ad in judged]
 
-    blocks.append({
-        "object": "block", "type": "table",
-        "table": {"table_width": 8, "has_column_header": True, "has_row_header": False, "children": rows}
-    })
+    blocks.append(_table(8, rows))
     return blocks
 
 
+# 인사이트 토글 내부 콜아웃: (인사이트 키, 아이콘, 라벨, 라벨 색상)
+INSIGHT_CALLOUTS = (
+    ('현상', "📊", "현상", "blue"),
+    ('So What', "🤔", "So What?", "purple"),
+    ('액션', "🎯", "액션 플랜", "orange"),
+)
+
+
+def _callout(emoji, label, color, content):
+    """굵은 색상 라벨 + 본문으로 구성된 콜아웃 블록 헬퍼"""
+    return {
+        "object": "block",
+        "type": "callout",
+        "callout": {
+            "icon": {"emoji": emoji},
+            "rich_text": [
+                _text(f"{label}\n", bold=True, color=color),
+                _text(content)
+            ]
+        }
+    }
+
+
 def create_campaign_insights_blocks(campaign):
     """캠페인 데이터 기반 인사이트 블록 생성 (현상 → So What → 액션)"""
-    blocks = [_heading(2, "💡 주요 인사이트 & 액션 플랜")]
-
-    audience = campaign.get('audience', {})
     spend = campaign['spend']
+    # 지출이 없으면 오디언스 분석(3~5) 전체 생략 (세그먼트 지출도 모두 0)
+    audience = campaign.get('audience', {}) if spend > 0 else {}
     insights = []
 
-    # 1. CTR 분석
+    # 1. CTR 분석 (업계 평균 1~5% 구간은 특이사항이 아니므로 생략)
     ctr = campaign['ctr']
     if ctr > 5:
         insights.append({
@@ -402,12 +448,6 @@ def create_campaign_insights_blocks(campaign):
             "So What": "광고 소재가 타겟 오디언스의 관심을 끌지 못하고 있음",
             "액션": "A/B 테스트를 통한 새로운 크리에이티브 시도. 카피 메시지와 이미지/영상 변경 필요"
         })
-    else:
-        insights.append({
-            "현상": f"CTR {ctr:.2f}%로 업계 평균(2-3%) 수준",
-            "So What": "안정적인 클릭률이지만 개선 여지 있음",
-            "액션": "상위 성과 소재 분석 후 베스트 요소 결합한 신규 소재 테스트"
-        })
 
     # 2. CPA 분석 (수동 전환수 기반)
     total_conversions = campaign.get('_manual_conversions')
@@ -427,9 +467,9 @@ def create_campaign_insights_blocks(campaign):
             })
 
     # 3. 연령대 분석
-    age_segments = sorted(audience.get('age', []), key=lambda x: x['spend'], reverse=True)
-    if age_segments and spend > 0:
-        top_age = age_segments[0]
+    age_segments = audience.get('age', [])
+    if age_segments:
+        top_age = max(age_segments, key=by_spend)
         concentration = top_age['spend'] / spend * 100
         insights.append({
             "현상": f"{top_age['age']}세 연령대가 지출의 {concentration:.1f}% 차지 (${top_age['spend']:,.2f})",
@@ -440,13 +480,13 @@ def create_campaign_insights_blocks(campaign):
     # 4. 성별 분석
     gender_segments = audience.get('gender', [])
     if len(gender_segments) >= 2:
-        male = next((s for s in gender_segments if s['gender'] == 'male'), None)
-        female = next((s for s in gender_segments if s['gender'] == 'female'), None)
-        if male and female and max(male['spend'], female['spend']) > 0:
-            diff_pct = abs(male['spend'] - female['spend']) / max(male['spend'], female['spend']) * 100
+        by_gender = {s['gender']: s for s in gender_segments}
+        male, female = by_gender.get('male'), by_gender.get('female')
+        dominant_spend = max(male['spend'], female['spend']) if male and female else 0
+        if dominant_spend > 0:
+            diff_pct = abs(male['spend'] - female['spend']) / dominant_spend * 100
             if diff_pct > 30:
                 dominant = "남성" if male['spend'] > female['spend'] else "여성"
-                dominant_spend = max(male['spend'], female['spend'])
                 insights.append({
                     "현상": f"{dominant} 지출 ${dominant_spend:,.2f}로 성별 간 {diff_pct:.0f}% 차이",
                     "So What": f"{dominant}이 주요 고객층. 반대 성별 시장 잠재력 미개척",
@@ -454,8 +494,9 @@ def create_campaign_insights_blocks(campaign):
                 })
 
     # 5. 지역 집중도 분석
-    region_segments = sorted(audience.get('region', []), key=lambda x: x['spend'], reverse=True)
-    if region_segments and spend > 0:
+    # 전체 정렬 없이 지출 상위 2개 지역만 추출
+    region_segments = nlargest(2, audience.get('region', []), key=by_spend)
+    if region_segments:
         top_region = region_segments[0]
         concentration = top_region['spend'] / spend * 100
         if concentration > 50:
@@ -466,7 +507,12 @@ def create_campaign_insights_blocks(campaign):
                 "액션": f"2순위 지역({second_region}) 예산 증액 테스트. 지역별 맞춤 메시지 적용"
             })
 
+    # 해당하는 인사이트가 없으면 헤딩도 생략
+    if not insights:
+        return []
+
     # 인사이트를 토글 블록으로 추가
+    blocks = [_heading(2, "💡 주요 인사이트 & 액션 플랜")]
     for i, insight in enumerate(insights, 1):
         title_text = insight['현상'][:60]
         if len(insight['현상']) > 60:
@@ -477,39 +523,8 @@ def create_campaign_insights_blocks(campaign):
             "toggle": {
                 "rich_text": [_text(f"인사이트 {i}: {title_text}", bold=True)],
                 "children": [
-                    {
-                        "object": "block",
-                        "type": "callout",
-                        "callout": {
-                            "icon": {"emoji": "📊"},
-                            "rich_text": [
-                                _text("현상\n", bold=True, color="blue"),
-                                _text(insight['현상'])
-                            ]
-                        }
-                    },
-                    {
-                        "object": "block",
-                        "type": "callout",
-                        "callout": {
-                            "icon": {"emoji": "🤔"},
-                            "rich_text": [
-                                _text("So What?\n", bold=True, color="purple"),
-                                _text(insight['So What'])
-                            ]
-                        }
-                    },
-                    {
-                        "object": "block",
-                        "type": "callout",
-                        "callout": {
-                            "icon": {"emoji": "🎯"},
-                            "rich_text": [
-                                _text("액션 플랜\n", bold=True, color="orange"),
-                                _text(insight['액션'])
-                            ]
-                        }
-                    }
+                    _callout(emoji, label, color, insight[key])
+                    for key, emoji, label, color in INSIGHT_CALLOUTS
                 ]
             }
         })
@@ -517,74 +532,151 @@ def create_campaign_insights_blocks(campaign):
     return blocks
 
 
-def check_existing_report(notion, database_id, week_title, date_start=None):
-    """같은 캠페인+주차의 기존 리포트가 있는지 확인"""
+def load_existing_reports(notion, database_id, date_start=None, property_ids=None):
+    """해당 주차의 기존 리포트를 한 번에 조회하여 {리포트 제목: 페이지} 반환
+
+    캠페인마다 조회하지 않고 주차 전체를 페이지네이션으로 한 번에 가져옵니다.
+    property_ids가 있으면 EXISTING_REPORT_PROPERTIES만 받아와 응답 크기를 줄입니다.
+    """
+    query_kwargs = {"database_id": database_id, "page_size": NOTION_MAX_CHILDREN}
     if date_start:
-        filter_cond = {
-            "and": [
-                {"property": "리포트 제목", "title": {"equals": week_title}},
-                {"property": "기간", "date": {"equals": date_start}},
-            ]
-        }
-    else:
-        filter_cond = {
-            "property": "리포트 제목",
-            "title": {"equals": week_title}
-        }
+        query_kwargs["filter"] = {"property": "기간", "date": {"equals": date_start}}
+
+    wanted = [property_ids[name] for name in EXISTING_REPORT_PROPERTIES if name in (property_ids or {})]
+    if wanted:
+        query_kwargs["filter_properties"] = wanted
+
+    existing = {}
+    while True:
+        query_result = notion.databases.query(**query_kwargs)
+        for page in query_result.get('results', []):
+            title = "".join(
+                t.get("plain_text", "") for t in page["properties"].get("리포트 제목", {}).get("title", [])
+            )
+            # 같은 제목이 여러 개면 첫 번째 페이지 사용
+            existing.setdefault(title, page)
+
+        if not query_result.get('has_more'):
+            break
+        query_kwargs["start_cursor"] = query_result['next_cursor']
+
+    return existing
+
+
+def _content_hash(properties, children):
+    """페이지 속성 + 본문 블록의 SHA-256 (변경 여부 판단용)"""
+    payload = json.dumps([properties, children], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _read_content_hash(page):
+    """페이지에 저장된 콘텐츠 해시 (없으면 빈 문자열)"""
+    rich_text = page.get("properties", {}).get(CONTENT_HASH_PROPERTY, {}).get("rich_text", [])
+    return "".join(t.get("plain_text", "") for t in rich_text)
+
+
+def _write_content_hash(notion, page_id, content_hash):
+    """본문 블록을 모두 쓴 뒤 마지막으로 콘텐츠 해시 기록
 
-    query_result = notion.databases.query(
-        database_id=database_id,
-        filter=filter_cond
+    중간에 실패한 페이지에 새 해시가 남으면 다음 실행에서 '변경 없음'으로 건너뛰어 복구되지 않으므로
+    삭제/추가가 전부 성공한 뒤에만 기록합니다.
+    """
+    notion.pages.update(
+        page_id=page_id,
+        properties={CONTENT_HASH_PROPERTY: {"rich_text": [{"text": {"content": content_hash}}]}}
     )
-    results = query_result.get('results', [])
-    return results[0]['id'] if results else None
 
 
-def _clear_page_blocks(notion, page_id):
-    """페이지의 기존 콘텐츠 블록 전부 삭제"""
-    children = notion.blocks.children.list(block_id=page_id)
-    for block in children.get("results", []):
-        notion.blocks.delete(block_id=block["id"])
+def _chunk(items, size=NOTION_MAX_CHILDREN):
+    """리스트를 size개씩 나눈 슬라이스 제너레이터"""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _append_blocks(notion, block_id, children):
+    """블록을 100개씩 나눠 추가 (페이지 내 순서 보장을 위해 순차 실행)"""
+    for chunk in _chunk(children):
+        notion.blocks.children.append(block_id=block_id, children=chunk)
 
 
-def _read_manual_conversions(notion, page_id):
+def _clear_page_blocks(notion, page_id):
+    """페이지의 기존 콘텐츠 블록 전부 삭제 (100개 초과분도 페이지네이션으로 수집)"""
+    block_ids = []
+    list_kwargs = {"block_id": page_id, "page_size": NOTION_MAX_CHILDREN}
+    while True:
+        response = notion.blocks.children.list(**list_kwargs)
+        block_ids.extend(block["id"] for block in response.get("results", []))
+        if not response.get("has_more"):
+            break
+        list_kwargs["start_cursor"] = response["next_cursor"]
+
+    # 삭제 순서는 무관하므로 병렬 처리 (요청 속도는 클라이언트의 토큰 버킷이 제한)
+    with ThreadPoolExecutor(max_workers=MAX_DELETE_WORKERS) as executor:
+        for _ in executor.map(lambda block_id: notion.blocks.delete(block_id=block_id), block_ids):
+            pass
+
+
+def _read_manual_conversions(page):
     """기존 페이지에서 수동 입력된 총 전환수를 읽어옴"""
-    page = notion.pages.retrieve(page_id=page_id)
     conv_prop = page.get("properties", {}).get("총 전환수", {})
     return conv_prop.get("number")
 
 
-def create_or_update_campaign_page(notion, database_id, campaign, date_range):
-    """캠페인별 Notion 페이지 생성 또는 업데이트"""
-    week_title = campaign['campaign_name'].replace("새 ", "").replace(" 캠페인", "")
-    date_start = date_range.get('since')
-    existing_page_id = check_existing_report(notion, database_id, week_title, date_start)
+def create_or_update_campaign_page(notion, database_id, campaign, date_range, existing_reports):
+    """캠페인별 Notion 페이지 생성 또는 업데이트
+
+    existing_reports: load_existing_reports()가 반환한 {리포트 제목: 페이지}
+                      새로 만든 페이지도 추가하여 같은 제목의 캠페인이 다시 나오면 중복 생성 대신 업데이트
+    """
+    week_title = report_title(campaign['campaign_name'])
+    existing_page = existing_reports.get(week_title)
 
-    if existing_page_id:
+    if existing_page:
         # 기존 페이지 → 수동 입력 전환수 보존
-        conversions = _read_manual_conversions(notion, existing_page_id)
+        existing_page_id = existing_page['id']
+        page_url = f"https://www.notion.so/{existing_page_id.replace('-', '')}"
+        conversions = _read_manual_conversions(existing_page)
         properties = create_campaign_page_properties(campaign, date_range, conversions)
         children = create_campaign_content_blocks(campaign, conversions)
 
+        # 지난 실행과 내용이 같으면 쓰기 생략
+        content_hash = _content_hash(properties, children)
+        if content_hash == _read_content_hash(existing_page):
+            print(f"   ⏭️  변경 없음, 건너뜀: {week_title}")
+            return page_url
+
         print(f"   📝 기존 리포트 업데이트: {week_title} (전환={conversions})")
-        notion.pages.update(page_id=existing_page_id, properties=properties)
-        _clear_page_blocks(notion, existing_page_id)
-        notion.blocks.children.append(block_id=existing_page_id, children=children)
-        page_url = f"https://www.notion.so/{existing_page_id.replace('-', '')}"
+        # 속성 업데이트와 본문 교체는 서로 독립적이므로 동시에 진행
+        # 기존 해시는 이때 비워 두고, 어느 쪽이든 실패하면 해시 없는 페이지로 남아 다음 실행에서 다시 작성
+        properties[CONTENT_HASH_PROPERTY] = {"rich_text": []}
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            update_future = executor.submit(
+                notion.pages.update, page_id=existing_page_id, properties=properties
+            )
+            _clear_page_blocks(notion, existing_page_id)
+            _append_blocks(notion, existing_page_id, children)
+            update_future.result()
+        _write_content_hash(notion, existing_page_id, content_hash)
     else:
         # 새 페이지 → API 전환 데이터 사용
         api_conversions = campaign['conversions']['total']
         properties = create_campaign_page_properties(campaign, date_range, api_conversions)
+        children = create_campaign_content_blocks(campaign, api_conversions)
+        # 해시는 다음 실행의 업데이트 경로와 같은 속성 기준으로 계산 (총 전환수 제외)
+        content_hash = _content_hash(properties, children)
         # 새 페이지에는 총 전환수도 기록
         properties["총 전환수"] = {"number": api_conversions}
-        children = create_campaign_content_blocks(campaign, api_conversions)
 
         print(f"   📝 새 리포트 생성: {week_title} (전환={api_conversions})")
         page = notion.pages.create(
             parent={"database_id": database_id},
             properties=properties,
-            children=children
+            children=children[:NOTION_MAX_CHILDREN]
         )
+        # 100개를 넘는 나머지 블록은 생성된 페이지에 이어서 추가
+        _append_blocks(notion, page['id'], children[NOTION_MAX_CHILDREN:])
+        _write_content_hash(notion, page['id'], content_hash)
+        existing_reports[week_title] = page
         page_url = page['url']
 
     return page_url
@@ -602,7 +694,7 @@ def main():
         if not notion_token:
             raise ValueError("NOTION_TOKEN이 .env에 설정되어야 합니다.")
 
-        notion = Client(auth=notion_token)
+        notion = _notion.get_client(notion_token)
         print("✅ Notion API 인증 완료")
 
         # Database ID 로드
@@ -610,20 +702,32 @@ def main():
         print(f"📊 Database ID: {database_id}")
 
         # DB 속성 확인
-        ensure_campaign_property(notion, database_id)
+        property_ids = ensure_database_properties(notion, database_id)
 
         # 처리된 데이터 로드
         data = get_latest_processed_data()
         date_range = data['date_range']
         campaigns = data['campaigns']
 
+        # 이번 주차 기존 리포트 일괄 조회
+        existing_reports = load_existing_reports(notion, database_id, date_range.get('since'), property_ids)
+
         print(f"📈 {len(campaigns)}개 캠페인 리포트 생성 중...")
 
-        # 캠페인별 페이지 생성
-        page_urls = []
+        # 같은 리포트 제목의 캠페인은 한 작업에서 순서대로 처리 (동시 생성으로 인한 중복 페이지 방지)
+        groups = {}
         for campaign in campaigns:
-            url = create_or_update_campaign_page(notion, database_id, campaign, date_range)
-            page_urls.append(url)
+            groups.setdefault(report_title(campaign['campaign_name']), []).append(campaign)
+
+        def upload(group):
+            return [
+                create_or_update_campaign_page(notion, database_id, campaign, date_range, existing_reports)
+                for campaign in group
+            ]
+
+        # 캠페인별 페이지 생성 (네트워크 대기 위주라 병렬 처리, 결과는 지출 순서 유지)
+        with ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS) as executor:
+            page_urls = [url for urls in executor.map(upload, groups.values()) for url in urls]
 
         print("=" * 60)
         print(f"✅ Notion 리포트 업데이트 완료! ({len(page_urls)}개 캠페인)")